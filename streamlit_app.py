@@ -1,15 +1,20 @@
 import streamlit as st
-import pandas as pd
 import boto3
 import botocore
-from boto3.dynamodb.conditions import Key
+from botocore.config import Config
+from boto3.dynamodb.conditions import Attr
 import decimal
 import uuid
 import hmac
-import base64
+import hashlib
+import pybase64 as base64  # Drop-in, faster replacement for the stdlib base64 module
+import itertools
+import time
+import xxhash
 from io import BytesIO
-from PIL import Image
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 # Set the title and favicon that appear in the Browser's tab bar.
 st.set_page_config(
@@ -18,16 +23,24 @@ st.set_page_config(
     layout='wide'
 )
 
-# Initialize the DynamoDB resource using credentials from secrets
-dynamodb = boto3.resource(
-    'dynamodb',
-    region_name=st.secrets["aws"]["aws_region"],
-    aws_access_key_id=st.secrets["aws"]["aws_access_key_id"],
-    aws_secret_access_key=st.secrets["aws"]["aws_secret_access_key"]
-)
+@st.cache_resource
+def get_dynamodb():
+    '''Returns the DynamoDB service resource, created once so all reruns and sessions reuse its client.'''
+    # Initialize the DynamoDB resource using credentials from secrets
+    return boto3.resource(
+        'dynamodb',
+        region_name=st.secrets["aws"]["aws_region"],
+        aws_access_key_id=st.secrets["aws"]["aws_access_key_id"],
+        aws_secret_access_key=st.secrets["aws"]["aws_secret_access_key"],
+        config=Config(
+            tcp_keepalive=True,
+            retries={'max_attempts': 2, 'mode': 'adaptive'},
+            max_pool_connections=10
+        )
+    )
 
-# Reference to the DynamoDB table
-table = dynamodb.Table(st.secrets["aws"]["dynamodb_table"])
+# Reference to the DynamoDB table. Table objects aren't thread-safe, so each run creates its own.
+table = get_dynamodb().Table(st.secrets["aws"]["dynamodb_table"])
 
 @st.experimental_dialog("Du hast das Geschenk vom Geschenketisch genommen", width='large')
 def show_purchase_confirmation(item_name, price):
@@ -42,17 +55,23 @@ def show_purchase_confirmation(item_name, price):
         st.session_state.purchase_done = True
         st.rerun()
 
-@st.cache_data(ttl='5s', show_spinner='Lade ...')
-def load_data():
-    '''Loads all wedding gifts data from DynamoDB, handling pagination.'''
+# Attributes needed to list the gifts. Images are fetched separately by load_images().
+LIST_ATTRIBUTES = (
+    'id', 'item_name', 'price', 'description', 'purchased',
+    'buyer_name', 'buyer_message', 'purchase_timestamp', 'image_hash'
+)
+
+def scan_segment(segment, total_segments, projection):
+    '''Scans one segment of the gifts table, handling pagination.'''
     items = []
     last_evaluated_key = None
+    scan_kwargs = dict(TableName=table.name, Segment=segment, TotalSegments=total_segments, **projection)
     
     while True:
         if last_evaluated_key:
-            response = table.scan(ExclusiveStartKey=last_evaluated_key)
+            response = table.meta.client.scan(ExclusiveStartKey=last_evaluated_key, **scan_kwargs)
         else:
-            response = table.scan()
+            response = table.meta.client.scan(**scan_kwargs)
         
         items.extend(response['Items'])
         
@@ -60,57 +79,200 @@ def load_data():
         if not last_evaluated_key:
             break
     
-    df = pd.DataFrame(items)
-    return df
+    return items
+
+# Writes call load_data.clear(), so every session sees them on its next rerun.
+@st.cache_data(ttl='60s', show_spinner='Lade ...')
+def load_data(attributes=LIST_ATTRIBUTES):
+    '''Loads the given attributes of all wedding gifts from DynamoDB with a parallel scan.'''
+    total_segments = st.secrets["aws"].get("scan_segments", 4)
+    projection = {
+        'ProjectionExpression': ', '.join(f'#{name}' for name in attributes),
+        'ExpressionAttributeNames': {f'#{name}': name for name in attributes}
+    }
+    segments = get_executor().map(
+        scan_segment,
+        range(total_segments),
+        itertools.repeat(total_segments),
+        itertools.repeat(projection)
+    )
+    items = [item for segment in segments for item in segment]
+    
+    # Build the display labels and convert prices once per scan instead of on every rerun.
+    for item in items:
+        # Labels show the stored Decimal, so a price of 25 reads "25" rather than "25.0".
+        item['display_price'] = str(item['price'])
+        if item.get('purchased'):
+            item['caption'] = f"{item['item_name']} (€{item['display_price']})"
+        else:
+            item['caption'] = f"{item['item_name']} ({item['display_price']}€)"
+            item['name_missing_label'] = f"Bitte gib noch deinen Namen ein, bevor Du {item['item_name']} vom virtuellen Geschenketisch nimmst"
+            item['buy_label'] = f"Jetzt {item['item_name']} für €{item['display_price']} vom virtuellen Geschenketisch nehmen"
+        # DynamoDB returns numbers as Decimal; only writes need to convert back.
+        item['price'] = float(item['price'])
+    
+    # Available gifts first, so split_by_purchased() can slice instead of filter.
+    items.sort(key=lambda item: bool(item.get('purchased')))
+    return items
+
+def split_by_purchased(items):
+    '''Splits the gifts loaded by load_data() into (available, purchased) lists.'''
+    available_count = sum(1 for item in items if not item.get('purchased'))
+    return items[:available_count], items[available_count:]
+
+# Functions run on this pool must not use the Table object or st.*: they call the thread-safe
+# client behind it (table.meta.client) directly and return errors instead of showing them.
+@st.cache_resource
+def get_executor():
+    '''Returns the thread pool shared by all sessions for DynamoDB calls and image work.'''
+    return ThreadPoolExecutor(max_workers=8)
+
+def fetch_image_data(item_id, attribute='image_data'):
+    '''Fetches a base64-encoded image attribute of a single product, or None if it is missing.'''
+    response = table.meta.client.get_item(
+        TableName=table.name,
+        Key={'id': item_id},
+        ProjectionExpression=attribute
+    )
+    return response.get('Item', {}).get(attribute)
+
+def fetch_image(item_id):
+    '''Fetches the image of a single product as encoded bytes, ready for st.image.'''
+    return base64.b64decode(fetch_image_data(item_id))
+
+def fetch_thumbnail(item_id):
+    '''Fetches the stored thumbnail of a product; older items get one downscaled from the full image.'''
+    thumb_data = fetch_image_data(item_id, 'thumb_data')
+    if thumb_data:
+        return base64.b64decode(thumb_data)
+    image_data = fetch_image_data(item_id)
+    if image_data is None:
+        return None
+    from PIL import Image
+    img = Image.open(BytesIO(base64.b64decode(image_data))).convert('RGB')
+    return compress_image(img, (256, 256))
+
+# Image bytes never change under an item id except through update_product(), which evicts them.
+# cache_resource hands out the cached bytes as-is, where cache_data would unpickle a copy per rerun.
+@st.cache_resource
+def get_image_cache():
+    '''Returns the {item_id: image bytes} cache shared by all sessions.'''
+    return {}
+
+@st.cache_resource
+def get_thumbnail_cache():
+    '''Returns the {item_id: thumbnail bytes} cache shared by all sessions.'''
+    return {}
+
+def load_cached(cache, fetch, item_ids):
+    '''Returns the cached bytes of the given products by item id, fetching missing ones in parallel.'''
+    images = {item_id: cache.get(item_id) for item_id in item_ids}
+    missing = [item_id for item_id, image in images.items() if image is None]
+    fetched = dict(zip(missing, get_executor().map(fetch, missing)))
+    cache.update(fetched)
+    images.update(fetched)
+    return images
+
+def load_images(item_ids):
+    '''Returns the images of the given products by item id.'''
+    return load_cached(get_image_cache(), fetch_image, item_ids)
+
+def load_thumbnails(item_ids):
+    '''Returns the thumbnails of the given products by item id.'''
+    return load_cached(get_thumbnail_cache(), fetch_thumbnail, item_ids)
 
 def mark_as_purchased(item_id, buyer_name, message):
-    '''Marks an item as purchased in DynamoDB and adds buyer info.'''
+    '''Marks an item as purchased in DynamoDB and adds buyer info; returns False if someone else was faster.'''
     timestamp = datetime.now().isoformat()
-    table.update_item(
-        Key={'id': item_id},
-        UpdateExpression='SET purchased = :val1, buyer_name = :val2, buyer_message = :val3, purchase_timestamp = :val4',
-        ExpressionAttributeValues={
-            ':val1': True,
-            ':val2': buyer_name,
-            ':val3': message,
-            ':val4': timestamp
-        }
-    )
+    try:
+        table.update_item(
+            Key={'id': item_id},
+            UpdateExpression='SET purchased = :val1, buyer_name = :val2, buyer_message = :val3, purchase_timestamp = :val4',
+            ConditionExpression=Attr('purchased').not_exists() | Attr('purchased').eq(False),
+            ExpressionAttributeValues={
+                ':val1': True,
+                ':val2': buyer_name,
+                ':val3': message,
+                ':val4': timestamp
+            }
+        )
+    except botocore.exceptions.ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            st.error("Dieses Geschenk hat gerade schon jemand anderes vom Geschenketisch genommen.")
+        else:
+            st.error(f"An error occurred: {str(e)}")
+        return False
+    finally:
+        load_data.clear()
+    return True
 
-def check_image_size(image, max_size_mb=1):
-    """Check if the image size is within the limit."""
+def check_image_size(image_bytes, max_size_mb=1):
+    """Check if the (compressed) image size is within the limit."""
     max_size_bytes = max_size_mb * 1024 * 1024  # Convert MB to bytes
-    return image.size <= max_size_bytes
+    return len(image_bytes) <= max_size_bytes
+
+def compress_image(img, max_dimensions):
+    '''Returns a copy of `img` downscaled to fit `max_dimensions`, encoded as WebP.'''
+    from PIL import Image
+    img = img.copy()
+    img.thumbnail(max_dimensions, Image.Resampling.LANCZOS)
+    buffered = BytesIO()
+    img.save(buffered, format="WEBP", quality=82, method=4)
+    return buffered.getvalue()
+
+def encode_image(image):
+    '''Compresses an uploaded image and returns (card image, grid thumbnail) as WebP bytes.'''
+    # PIL is only needed for uploads, so don't load it for every guest session.
+    from PIL import Image
+    img = Image.open(image).convert('RGB')
+    return compress_image(img, (800, 800)), compress_image(img, (256, 256))
+
+def hash_image(image_bytes):
+    '''Returns a fast content hash of compressed image bytes, to detect re-uploads of the same image.'''
+    return xxhash.xxh64(image_bytes).hexdigest()
 
 def add_product(item_name, price, image, description):
-    '''Adds a new product to DynamoDB with image data and description.'''
+    '''Adds a new product to DynamoDB with image data and description, returning an error message or None.'''
     item_id = str(uuid.uuid4())
     price_decimal = decimal.Decimal(str(price))
     
-    if not check_image_size(image):
-        st.error(f"Image size exceeds the limit. Please upload a smaller image.")
-        return False
-
-    img_str = base64.b64encode(image.read()).decode()
-
+    image_bytes, thumb_bytes = encode_image(image)
+    if not check_image_size(image_bytes):
+        return "Image size exceeds the limit. Please upload a smaller image."
+
+    return add_products([{
+        'id': item_id,
+        'item_name': item_name,
+        'price': price_decimal,
+        'image_data': base64.b64encode(image_bytes).decode(),
+        'thumb_data': base64.b64encode(thumb_bytes).decode(),
+        'image_hash': hash_image(image_bytes),
+        'description': description,
+        'purchased': False
+    }])
+
+def add_products(items, max_attempts=5):
+    '''Adds several prepared products to DynamoDB in batches of 25, returning an error message or None.'''
     try:
-        table.put_item(
-            Item={
-                'id': item_id,
-                'item_name': item_name,
-                'price': price_decimal,
-                'image_data': img_str,
-                'description': description,
-                'purchased': False
-            }
-        )
+        for start in range(0, len(items), 25):
+            request_items = {table.name: [{'PutRequest': {'Item': item}} for item in items[start:start + 25]]}
+            # Throttled puts come back as UnprocessedItems rather than an error, so botocore's
+            # retries don't cover them: resend with exponential backoff, a limited number of times.
+            for attempt in range(max_attempts):
+                if attempt:
+                    time.sleep(0.1 * 2 ** attempt)
+                response = table.meta.client.batch_write_item(RequestItems=request_items)
+                request_items = response.get('UnprocessedItems')
+                if not request_items:
+                    break
+            else:
+                return "DynamoDB is busy and did not store all products. Please try again."
     except botocore.exceptions.ClientError as e:
-        st.error(f"An error occurred: {str(e)}")
-        return False
-    return True
+        return f"An error occurred: {str(e)}"
+    return None
 
-def update_product(item_id, item_name, price, description, image=None):
-    '''Updates an existing product in DynamoDB.'''
+def update_product(item_id, item_name, price, description, image=None, current_image_hash=None):
+    '''Updates an existing product in DynamoDB, writing a new image only if it differs from `current_image_hash`.'''
     update_expression = 'SET item_name = :name, price = :price, description = :desc'
     expression_attribute_values = {
         ':name': item_name,
@@ -118,14 +280,20 @@ def update_product(item_id, item_name, price, description, image=None):
         ':desc': description
     }
 
+    image_changed = False
     if image:
-        if not check_image_size(image):
+        image_bytes, thumb_bytes = encode_image(image)
+        if not check_image_size(image_bytes):
             st.error(f"Image size exceeds the limit of 1MB. Please upload a smaller image.")
             return False
 
-        img_str = base64.b64encode(image.read()).decode()
-        update_expression += ', image_data = :image'
-        expression_attribute_values[':image'] = img_str
+        image_hash = hash_image(image_bytes)
+        image_changed = image_hash != current_image_hash
+        if image_changed:
+            update_expression += ', image_data = :image, thumb_data = :thumb, image_hash = :hash'
+            expression_attribute_values[':image'] = base64.b64encode(image_bytes).decode()
+            expression_attribute_values[':thumb'] = base64.b64encode(thumb_bytes).decode()
+            expression_attribute_values[':hash'] = image_hash
 
     try:
         table.update_item(
@@ -136,8 +304,30 @@ def update_product(item_id, item_name, price, description, image=None):
     except botocore.exceptions.ClientError as e:
         st.error(f"An error occurred: {str(e)}")
         return False
+    if image_changed:
+        get_image_cache().pop(item_id, None)
+        get_thumbnail_cache().pop(item_id, None)
+    load_data.clear()
     return True
 
+@st.experimental_fragment(run_every=1)
+def poll_pending_upload():
+    '''Checks once a second whether the background product upload has finished.'''
+    pending_upload = st.session_state.get('pending_upload')
+    if pending_upload is None:
+        return
+    if not pending_upload.done():
+        st.info('Uploading product ...')
+        return
+    del st.session_state['pending_upload']
+    try:
+        st.session_state['upload_error'] = pending_upload.result()
+    except Exception as e:
+        # e.g. an unreadable image or a connection error in the worker
+        st.session_state['upload_error'] = f"An error occurred: {str(e)}"
+    load_data.clear()
+    st.rerun()
+
 def admin_panel():
     '''Displays the admin panel for managing products.'''
     st.title('Admin Panel')
@@ -149,27 +339,40 @@ def admin_panel():
     image = st.file_uploader('Upload Image', type=['jpg', 'jpeg', 'png'])
 
     if st.button('Add Product'):
-        if item_name and price and description and image:
-            if add_product(item_name, price, image, description):
-                st.success('Product added successfully!')
-            else:
-                st.error('Failed to add product. Please try again.')
+        if 'pending_upload' in st.session_state:
+            st.warning('The previous product is still uploading. Please wait until it is done.')
+        elif item_name and price and description and image:
+            # Compress and store in the background so the panel stays usable meanwhile.
+            st.session_state['pending_upload'] = get_executor().submit(
+                add_product, item_name, price, BytesIO(image.getvalue()), description
+            )
         else:
             st.error('Please fill in all fields and upload an image.')
 
-    df = load_data()
+    # Only poll while an upload is pending, so idle admin sessions don't rerun every second.
+    if 'pending_upload' in st.session_state:
+        poll_pending_upload()
+    if 'upload_error' in st.session_state:
+        upload_error = st.session_state.pop('upload_error')
+        if upload_error is None:
+            st.success('Product added successfully!')
+        else:
+            st.error(upload_error)
+            st.error('Failed to add product. Please try again.')
+
+    items = load_data()
+    available_items, bought_items = split_by_purchased(items)
 
     st.subheader('Bought Items')
-    bought_df = df[df['purchased'] == True] if not df.empty else pd.DataFrame()
-    if bought_df.empty:
+    if not bought_items:
         st.write("No available items.")
     else:
-        for index, row in bought_df.iterrows():
+        for row in bought_items:
             with st.expander(f"Open {row['item_name']}"):
                 st.write(f"Item Name: {row['item_name']}")
                 st.write(f"Price: EUR {row['price']:.2f}")
-                st.write(f"Buyer Name: {row['buyer_name']}")
-                st.write(f"Buyer Message: {row['buyer_message']}")
+                st.write(f"Buyer Name: {row.get('buyer_name', '')}")
+                st.write(f"Buyer Message: {row.get('buyer_message', '')}")
                 if 'purchase_timestamp' in row:
                     #purchase_time = datetime.fromisoformat(row['purchase_timestamp'])
                     st.write(f"Purchased on: {row['purchase_timestamp']}")
@@ -177,43 +380,82 @@ def admin_panel():
                     st.write("Purchase time: Not available")
 
     st.subheader('Available Items')
-    available_df = df[df['purchased'] == False] if not df.empty else pd.DataFrame()
-    if available_df.empty:
+    if not available_items:
         st.write("No available items.")
     else:
-        for index, row in available_df.iterrows():
+        for row in available_items:
             with st.expander(f"Edit {row['item_name']}"):
                 new_name = st.text_input('Item Name', value=row['item_name'], key=f"name_{row['id']}")
-                new_price = st.number_input('Price', value=float(row['price']), min_value=0.0, format="%.2f", key=f"price_{row['id']}")
-                new_description = st.text_area('Description', value=row['description'], key=f"description_{row['id']}")
+                new_price = st.number_input('Price', value=row['price'], min_value=0.0, format="%.2f", key=f"price_{row['id']}")
+                new_description = st.text_area('Description', value=row.get('description', ''), key=f"description_{row['id']}")
                 new_image = st.file_uploader('Upload New Image', type=['jpg', 'jpeg', 'png'], key=f"image_{row['id']}")
                 
                 if st.button('Update Product', key=f"update_{row['id']}"):
-                    if update_product(row['id'], new_name, new_price, new_description, new_image):
+                    if update_product(row['id'], new_name, new_price, new_description, new_image, row.get('image_hash')):
                         st.success('Product updated successfully!')
                         st.rerun()
                     else:
                         st.error('Failed to update product. Please try again.')
 
         with st.expander('all data'):
-            df
+            # Only the stored attributes, not the display labels load_data() adds to each item.
+            st.dataframe([{name: item.get(name) for name in LIST_ATTRIBUTES} for item in items])
+
+# Styles for the shop page, emitted on every run (Streamlit drops elements a rerun doesn't re-emit).
+SHOP_CSS = """
+<style>
+.logo-image {
+    border-radius: 15px;
+    overflow: hidden;
+}
+.logo-image img {
+    width: 100%;
+    height: auto;
+    display: block;
+}
+</style>
+"""
+
+@st.cache_resource(show_spinner=False)
+def load_logo():
+    '''Reads the logo from disk once instead of on every rerun.'''
+    return Path('paja.png').read_bytes()
+
+# Number of purchased gifts shown per page: two full rows of the five-column grid.
+PURCHASED_PAGE_SIZE = 10
+
+@st.experimental_fragment
+def render_gift_card(row, image):
+    '''Renders one available gift. Typing in or clicking its widgets only reruns this card.'''
+    with st.container(border=True):
+        st.image(image, caption=row['caption'], use_column_width=True)
+        if 'description' in row:
+            st.write(row['description'])
+        
+        item_id = row['id']
+        purchased_key, name_key, message_key, buy_key = (
+            f"purchased_{item_id}", f"name_{item_id}", f"message_{item_id}", f"buy_button_{item_id}"
+        )
+        
+        if not st.session_state.setdefault(purchased_key, False):
+            with st.popover("Vom Geschenketisch nehmen"):
+                name = st.text_input("Magst Du ergänzen wer Du bist?", key=name_key)
+                message = st.text_area("Möchtest Du eine Nachricht hinzufügen?", key=message_key)
+                # Check if name is not empty
+                if not name.strip():
+                    if st.button(row['name_missing_label'], key=buy_key, type='primary', disabled=True):
+                        pass
+                else:
+                    if st.button(row['buy_label'], key=buy_key, type='primary'):
+                        if mark_as_purchased(item_id, name, message):
+                            # Dialogs are fragments and can't open inside this one; shop_page() shows it.
+                            st.session_state['confirm_purchase'] = (row['item_name'], row['display_price'])
+                            st.rerun()
 
 def shop_page():
     '''Displays the shopping page.'''
 
-    st.markdown("""
-    <style>
-    .logo-image {
-        border-radius: 15px;
-        overflow: hidden;
-    }
-    .logo-image img {
-        width: 100%;
-        height: auto;
-        display: block;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(SHOP_CSS, unsafe_allow_html=True)
 
     # Create a container for the logo
     logo_container = st.container()
@@ -221,67 +463,63 @@ def shop_page():
     with logo_container:
         col1, col2, col3 = st.columns([1,2,1])
         with col2:
-            st.image('paja.png', use_column_width=True)
+            st.image(load_logo(), use_column_width=True)
 
     # Add some space after the logo
     st.markdown("<br>", unsafe_allow_html=True)
 
-    df = load_data()
+    items = load_data()
+    available_items, purchased_items = split_by_purchased(items)
+
+    if 'confirm_purchase' in st.session_state:
+        show_purchase_confirmation(*st.session_state.pop('confirm_purchase'))
 
     st.subheader(":rainbow-background[Geschenketisch]", divider='rainbow')
-    available_items = df[df['purchased'] == False] if not df.empty else pd.DataFrame()
-    if available_items.empty:
+    if not available_items:
         st.info("Der Geschenketisch mit Ideen ist gerade leer!")
     else:
-        cols = st.columns(3)
-        for i, (_, row) in enumerate(available_items.iterrows()):
-            with cols[i % 3]:
-                with st.container(border=True):
-                    image = Image.open(BytesIO(base64.b64decode(row['image_data'])))
-                    caption = f"{row['item_name']} ({row['price']}€)"
-                    st.image(image, caption=caption, use_column_width=True)
-                    if 'description' in row:
-                        st.write(row['description'])
-                    
-                    if f"purchased_{row['id']}" not in st.session_state:
-                        st.session_state[f"purchased_{row['id']}"] = False
-                    
-                    if not st.session_state[f"purchased_{row['id']}"]:
-                        with st.popover("Vom Geschenketisch nehmen"):
-                            name = st.text_input("Magst Du ergänzen wer Du bist?", key=f"name_{row['id']}")
-                            message = st.text_area("Möchtest Du eine Nachricht hinzufügen?", key=f"message_{row['id']}")
-                            # Check if name is not empty
-                            if not name.strip():
-                                if st.button(f"Bitte gib noch deinen Namen ein, bevor Du {row['item_name']} vom virtuellen Geschenketisch nimmst", key=f"buy_button_{row['id']}", type='primary', disabled=True):
-                                    pass
-                            else:
-                                if st.button(f"Jetzt {row['item_name']} für €{row['price']} vom virtuellen Geschenketisch nehmen", key=f"buy_button_{row['id']}", type='primary'):
-                                    mark_as_purchased(row['id'], name, message)
-                                    show_purchase_confirmation(row['item_name'], row['price'])
+        images = load_images(tuple(item['id'] for item in available_items))
+        cols = itertools.cycle(st.columns(3))
+        for row in available_items:
+            with next(cols):
+                render_gift_card(row, images[row['id']])
 
     st.subheader("Schon geschenkt", divider='blue')
-    purchased_items = df[df['purchased'] == True] if not df.empty else pd.DataFrame()
-    if purchased_items.empty:
+    if not purchased_items:
         st.write("Sei der erste, der ein Geschenk auswählt.")
     else:
-        cols = st.columns(5)
-        for i, (_, row) in enumerate(purchased_items.iterrows()):
-            with cols[i % 5]:
-                image = Image.open(BytesIO(base64.b64decode(row['image_data'])))
-                st.image(image, width=200, caption=f"{row['item_name']} (€{row['price']})")
+        # Only render the first pages of purchased gifts; "Mehr laden" reveals the next one.
+        cursor = st.session_state.setdefault('purchased_cursor', PURCHASED_PAGE_SIZE)
+        visible_items = purchased_items[:cursor]
+        # st.image serves the thumbnails through the media endpoint, so browsers can cache them.
+        thumbnails = load_thumbnails(tuple(item['id'] for item in visible_items))
+        cols = itertools.cycle(st.columns(5))
+        for row in visible_items:
+            with next(cols):
+                thumbnail = thumbnails[row['id']]
+                if thumbnail is None:
+                    st.caption(row['caption'])
+                else:
+                    st.image(thumbnail, width=200, caption=row['caption'])
                 if 'description' in row:
-                    description = row['description']
-                    # Ensure the description is a string
-                    if not isinstance(description, str):
-                        description = str(description)
-                    st.caption('Details öffnen:', help=description)
+                    st.caption('Details öffnen:', help=str(row['description']))
+        if len(purchased_items) > cursor:
+            if st.button("Mehr laden"):
+                st.session_state['purchased_cursor'] += PURCHASED_PAGE_SIZE
+                st.rerun()
+
+@st.cache_resource
+def get_password_digest(key):
+    '''Returns the SHA-256 digest of a password secret, computed once per process.'''
+    return hashlib.sha256(st.secrets[key].encode()).digest()
 
 def check_password(password_key):
     """Returns `True` if the user had the correct password."""
 
     def password_entered():
         """Checks whether a password entered by the user is correct."""
-        if hmac.compare_digest(st.session_state["password"], st.secrets[password_key]):
+        entered_digest = hashlib.sha256(st.session_state["password"].encode()).digest()
+        if hmac.compare_digest(entered_digest, get_password_digest(password_key)):
             st.session_state["password_correct"] = True
             del st.session_state["password"]  # Don't store the password.
         else: